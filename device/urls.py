@@ -3,5 +3,11 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    # Specialized routes for the known locations resolve the location at
+    # import time instead of per request
+    *[
+        path(f"{device_name}/", view, name=f"device_detail_{device_name}")
+        for device_name, view in views.specialized_device_views.items()
+    ],
     path("<str:device_name>/", views.device_detail, name="device_detail"),
 ]
@@ -1,206 +1,343 @@
+import asyncio
 import json
 from datetime import timedelta
+from django.core.cache import cache
 from django.db import models
+from django.db.models.functions import Round, TruncDay, TruncMonth
 from django.http import Http404
 from django.shortcuts import render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
 
-from homepage.models import Temperature
+from homepage.models import Temperature, TemperatureHourly
 
+# Optional C-speed JSON encoder for the chart payloads
+try:
+    import orjson
 
-def device_detail(request, device_name):
+    def _dumps_json(data):
+        return orjson.dumps(data).decode()
+
+except ImportError:
+    _dumps_json = json.dumps
+
+
+# Known device name -> database location mapping, hoisted to module scope
+# so the specialized per-location routes can be built once at import
+LOCATION_MAP = {
+    'living-room': 'Living Room',
+    'bedroom': 'Bedroom',
+    'office': 'Office',
+    'outdoor': 'Outdoor'
+}
+
+
+async def device_detail(request, device_name):
     """Display detailed statistics for a specific device/location."""
     # Normalize device name to match database location format
-    location_map = {
-        'living-room': 'Living Room',
-        'bedroom': 'Bedroom',
-        'office': 'Office',
-        'outdoor': 'Outdoor'
-    }
+    location = LOCATION_MAP.get(device_name.lower(), device_name.replace('-', ' ').title())
+    # Canonical slug stored at ingest; raw-table filters hit the
+    # (location_slug, timestamp) index directly
+    location_slug = slugify(device_name)
 
-    location = location_map.get(device_name.lower(), device_name.replace('-', ' ').title())
+    return await _render_device_page(request, device_name, location, location_slug)
+
+
+def _make_specialized_device_view(device_name, location, location_slug):
+    """Build a view with the location already resolved, skipping the
+    per-request normalization for the known devices."""
+
+    async def view(request):
+        return await _render_device_page(request, device_name, location, location_slug)
+
+    return view
+
+
+# Pre-specialized views for the four canonical locations; unknown slugs
+# fall through to the generic device_detail handler
+specialized_device_views = {
+    device_name: _make_specialized_device_view(
+        device_name, location, slugify(device_name)
+    )
+    for device_name, location in LOCATION_MAP.items()
+}
 
-    # Check if the location exists in the database
-    if not Temperature.objects.filter(location=location).exists():
-        # Return a 404 if no data exists for this location
-        raise Http404(f"No temperature data found for location: {location}")
+
+async def _render_device_page(request, device_name, location, location_slug):
+    """Shared request handling once the location has been resolved."""
+    # Keyset bookmark for paging the recent-readings timeline.
+    # parse_datetime returns None for malformed strings but raises
+    # ValueError for well-formed-but-invalid ones (e.g. month 13);
+    # treat both the same and serve the first page
+    before_param = request.GET.get('before', '')
+    try:
+        before = parse_datetime(before_param) if before_param else None
+    except ValueError:
+        before = None
+    if before is None:
+        # Unusable bookmarks share the first page's cache entry
+        before_param = ''
 
     # Get current time for calculations
     now = timezone.now()
 
+    # New readings arrive every few minutes, so cache the whole computed
+    # context per minute bucket and skip the aggregate work on repeat hits
+    cache_key = f"device_ctx:{location_slug}:{before_param}:{int(now.timestamp()) // 60}"
+    context = await cache.aget(cache_key)
+    if context is None:
+        context = await _build_device_context(device_name, location, location_slug, now, before)
+        await cache.aset(cache_key, context, 90)
+
+    return render(request, 'device/device.html', context)
+
+
+async def _build_device_context(device_name, location, location_slug, now, before=None):
+    """Compute the full template context for a device page."""
     # Calculate time ranges
     one_hour_ago = now - timedelta(hours=1)
     one_day_ago = now - timedelta(days=1)
     one_week_ago = now - timedelta(weeks=1)
     one_month_ago = now - timedelta(days=30)
 
-    # Get latest reading
-    latest_reading = Temperature.objects.filter(location=location).first()
+    # Calculate averages and extremes for all time periods in a single
+    # conditional-aggregate query instead of one query per window.
+    # The unfiltered totals double as the existence check for the 404.
+    hourly_q = models.Q(timestamp__gte=one_hour_ago)
+    daily_q = models.Q(timestamp__gte=one_day_ago)
+    weekly_q = models.Q(timestamp__gte=one_week_ago)
+    monthly_q = models.Q(timestamp__gte=one_month_ago)
 
-    # Calculate averages for different time periods
-    hourly_avg = Temperature.objects.filter(
-        location=location,
-        timestamp__gte=one_hour_ago
-    ).aggregate(
-        avg_temp=models.Avg('temperature'),
-        avg_humidity=models.Avg('humidity'),
-        count=models.Count('id')
+    stats_query = Temperature.objects.filter(location_slug=location_slug).aaggregate(
+        hourly_avg_temp=models.Avg('temperature', filter=hourly_q),
+        hourly_avg_humidity=models.Avg('humidity', filter=hourly_q),
+        hourly_count=models.Count('id', filter=hourly_q),
+        daily_avg_temp=models.Avg('temperature', filter=daily_q),
+        daily_avg_humidity=models.Avg('humidity', filter=daily_q),
+        daily_count=models.Count('id', filter=daily_q),
+        weekly_avg_temp=models.Avg('temperature', filter=weekly_q),
+        weekly_avg_humidity=models.Avg('humidity', filter=weekly_q),
+        weekly_count=models.Count('id', filter=weekly_q),
+        monthly_avg_temp=models.Avg('temperature', filter=monthly_q),
+        monthly_avg_humidity=models.Avg('humidity', filter=monthly_q),
+        monthly_count=models.Count('id', filter=monthly_q),
+        daily_min_temp=models.Min('temperature', filter=daily_q),
+        daily_max_temp=models.Max('temperature', filter=daily_q),
+        daily_min_humidity=models.Min('humidity', filter=daily_q),
+        daily_max_humidity=models.Max('humidity', filter=daily_q),
+        weekly_min_temp=models.Min('temperature', filter=weekly_q),
+        weekly_max_temp=models.Max('temperature', filter=weekly_q),
+        weekly_min_humidity=models.Min('humidity', filter=weekly_q),
+        weekly_max_humidity=models.Max('humidity', filter=weekly_q),
+        total_count=models.Count('id'),
+        total_avg_temp=models.Avg('temperature'),
+        total_avg_humidity=models.Avg('humidity'),
+        total_min_temp=models.Min('temperature'),
+        total_max_temp=models.Max('temperature'),
+        total_min_humidity=models.Min('humidity'),
+        total_max_humidity=models.Max('humidity'),
+        first_timestamp=models.Min('timestamp'),
     )
 
-    daily_avg = Temperature.objects.filter(
-        location=location,
-        timestamp__gte=one_day_ago
-    ).aggregate(
-        avg_temp=models.Avg('temperature'),
-        avg_humidity=models.Avg('humidity'),
-        count=models.Count('id')
-    )
+    # Get recent readings for timeline as narrow plain dicts.
+    # Pages use a keyset bookmark (timestamp__lt) instead of offsets, so
+    # deep pages stay an index range scan on (location_slug, timestamp).
+    recent_qs = Temperature.objects.filter(location_slug=location_slug)
+    if before is not None:
+        recent_qs = recent_qs.filter(timestamp__lt=before)
 
-    weekly_avg = Temperature.objects.filter(
-        location=location,
-        timestamp__gte=one_week_ago
-    ).aggregate(
-        avg_temp=models.Avg('temperature'),
-        avg_humidity=models.Avg('humidity'),
-        count=models.Count('id')
-    )
+    async def fetch_recent():
+        return [
+            row
+            async for row in recent_qs.order_by('-timestamp')
+            .values('temperature', 'humidity', 'timestamp')[:20]
+        ]
 
-    monthly_avg = Temperature.objects.filter(
-        location=location,
-        timestamp__gte=one_month_ago
-    ).aggregate(
-        avg_temp=models.Avg('temperature'),
-        avg_humidity=models.Avg('humidity'),
-        count=models.Count('id')
-    )
+    # The aggregate and the timeline are independent; run them
+    # concurrently so view latency is max(Q1, Q2) rather than Q1+Q2
+    stats, recent_readings = await asyncio.gather(stats_query, fetch_recent())
 
-    # Get min/max values for different periods
-    daily_extremes = Temperature.objects.filter(
-        location=location,
-        timestamp__gte=one_day_ago
-    ).aggregate(
-        min_temp=models.Min('temperature'),
-        max_temp=models.Max('temperature'),
-        min_humidity=models.Min('humidity'),
-        max_humidity=models.Max('humidity')
+    if not stats['total_count']:
+        # Return a 404 if no data exists for this location
+        raise Http404(f"No temperature data found for location: {location}")
+
+    # Bookmark for the "older readings" link when a full page came back
+    recent_readings_next_before = (
+        recent_readings[-1]['timestamp'].isoformat()
+        if len(recent_readings) == 20 else None
     )
 
-    weekly_extremes = Temperature.objects.filter(
+    # The newest row doubles as latest_reading on the first page; deeper
+    # pages still need the true latest for the header
+    latest_reading = None
+    if before is None and recent_readings:
+        newest = recent_readings[0]
+    else:
+        newest = await (
+            Temperature.objects.filter(location_slug=location_slug)
+            .order_by('-timestamp')
+            .values('temperature', 'humidity', 'timestamp')
+            .afirst()
+        )
+    if newest:
+        latest_reading = {
+            'temperature': newest['temperature'],
+            'temperature_fahrenheit': (newest['temperature'] * 9 / 5) + 32,
+            'humidity': newest['humidity'],
+            'timestamp': newest['timestamp'],
+        }
+
+    # Repack into the per-window dicts the template expects
+    hourly_avg = {
+        'avg_temp': stats['hourly_avg_temp'],
+        'avg_humidity': stats['hourly_avg_humidity'],
+        'count': stats['hourly_count'],
+    }
+    daily_avg = {
+        'avg_temp': stats['daily_avg_temp'],
+        'avg_humidity': stats['daily_avg_humidity'],
+        'count': stats['daily_count'],
+    }
+    weekly_avg = {
+        'avg_temp': stats['weekly_avg_temp'],
+        'avg_humidity': stats['weekly_avg_humidity'],
+        'count': stats['weekly_count'],
+    }
+    monthly_avg = {
+        'avg_temp': stats['monthly_avg_temp'],
+        'avg_humidity': stats['monthly_avg_humidity'],
+        'count': stats['monthly_count'],
+    }
+    daily_extremes = {
+        'min_temp': stats['daily_min_temp'],
+        'max_temp': stats['daily_max_temp'],
+        'min_humidity': stats['daily_min_humidity'],
+        'max_humidity': stats['daily_max_humidity'],
+    }
+    weekly_extremes = {
+        'min_temp': stats['weekly_min_temp'],
+        'max_temp': stats['weekly_max_temp'],
+        'min_humidity': stats['weekly_min_humidity'],
+        'max_humidity': stats['weekly_max_humidity'],
+    }
+
+    # Get hourly data for the last 24 hours for detailed chart.
+    # Averages are computed and rounded DB-side; SQL division returns
+    # NULL for empty humidity buckets, so the rows come back display-ready.
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    hourly_rows = TemperatureHourly.objects.filter(
         location=location,
-        timestamp__gte=one_week_ago
-    ).aggregate(
-        min_temp=models.Min('temperature'),
-        max_temp=models.Max('temperature'),
-        min_humidity=models.Min('humidity'),
-        max_humidity=models.Max('humidity')
-    )
+        hour__gte=current_hour - timedelta(hours=23)
+    ).annotate(
+        avg_temp=Round(models.F('sum_temperature') / models.F('count'), 1),
+        avg_humidity=Round(models.F('sum_humidity') / models.F('humidity_count'), 1)
+    ).values('hour', 'avg_temp', 'avg_humidity', 'count')
+    hourly_by_bucket = {row['hour']: row async for row in hourly_rows}
 
-    # Get hourly data for the last 24 hours for detailed chart
     hourly_data = []
-    for i in range(24):
-        hour_start = now - timedelta(hours=i+1)
-        hour_end = now - timedelta(hours=i)
-
-        hour_avg = Temperature.objects.filter(
-            location=location,
-            timestamp__gte=hour_start,
-            timestamp__lt=hour_end
-        ).aggregate(
-            avg_temp=models.Avg('temperature'),
-            avg_humidity=models.Avg('humidity'),
-            count=models.Count('id')
-        )
+    for i in range(23, -1, -1):
+        hour_start = current_hour - timedelta(hours=i)
+        row = hourly_by_bucket.get(hour_start)
 
         hourly_data.append({
             'hour': hour_start.strftime('%H:%M'),
             'timestamp': hour_start.isoformat(),
-            'avg_temp': round(hour_avg['avg_temp'], 1) if hour_avg['avg_temp'] else None,
-            'avg_humidity': round(hour_avg['avg_humidity'], 1) if hour_avg['avg_humidity'] else None,
-            'count': hour_avg['count']
+            'avg_temp': row['avg_temp'] if row else None,
+            'avg_humidity': row['avg_humidity'] if row else None,
+            'count': row['count'] if row else 0
         })
 
-    # Reverse to get chronological order
-    hourly_data.reverse()
+    # Get daily data for the last 7 days by re-aggregating hourly rollups
+    week_start = (now - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
+    daily_rows = TemperatureHourly.objects.filter(
+        location=location,
+        hour__gte=week_start
+    ).annotate(
+        bucket=TruncDay('hour')
+    ).values('bucket').annotate(
+        avg_temp=Round(
+            models.Sum('sum_temperature') / models.Sum('count'), 1
+        ),
+        avg_humidity=Round(
+            models.Sum('sum_humidity') / models.Sum('humidity_count'), 1
+        ),
+        min_temp=Round(models.Min('min_temperature'), 1),
+        max_temp=Round(models.Max('max_temperature'), 1),
+        count=models.Sum('count')
+    ).order_by('bucket')
+    daily_by_bucket = {row['bucket']: row async for row in daily_rows}
 
-    # Get daily data for the last 7 days
     daily_data = []
-    for i in range(7):
+    for i in range(6, -1, -1):
         day_start = (now - timedelta(days=i)).replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        day_avg = Temperature.objects.filter(
-            location=location,
-            timestamp__gte=day_start,
-            timestamp__lt=day_end
-        ).aggregate(
-            avg_temp=models.Avg('temperature'),
-            avg_humidity=models.Avg('humidity'),
-            min_temp=models.Min('temperature'),
-            max_temp=models.Max('temperature'),
-            count=models.Count('id')
-        )
+        row = daily_by_bucket.get(day_start)
 
         daily_data.append({
             'date': day_start.strftime('%m/%d'),
             'full_date': day_start.strftime('%Y-%m-%d'),
             'day_name': day_start.strftime('%A'),
-            'avg_temp': round(day_avg['avg_temp'], 1) if day_avg['avg_temp'] else None,
-            'avg_humidity': round(day_avg['avg_humidity'], 1) if day_avg['avg_humidity'] else None,
-            'min_temp': round(day_avg['min_temp'], 1) if day_avg['min_temp'] else None,
-            'max_temp': round(day_avg['max_temp'], 1) if day_avg['max_temp'] else None,
-            'count': day_avg['count']
+            'avg_temp': row['avg_temp'] if row else None,
+            'avg_humidity': row['avg_humidity'] if row else None,
+            'min_temp': row['min_temp'] if row else None,
+            'max_temp': row['max_temp'] if row else None,
+            'count': row['count'] if row else 0
         })
 
-    # Reverse to get chronological order
-    daily_data.reverse()
+    # Total statistics come from the consolidated aggregate above
+    total_stats = {
+        'total_count': stats['total_count'],
+        'avg_temp': stats['total_avg_temp'],
+        'avg_humidity': stats['total_avg_humidity'],
+        'min_temp': stats['total_min_temp'],
+        'max_temp': stats['total_max_temp'],
+        'min_humidity': stats['total_min_humidity'],
+        'max_humidity': stats['total_max_humidity'],
+    }
 
-    # Get recent readings for timeline
-    recent_readings = Temperature.objects.filter(
-        location=location
-    ).order_by('-timestamp')[:20]
+    # First reading date comes from the consolidated aggregate
+    first_ts = stats['first_timestamp']
+    first_reading = {'timestamp': first_ts} if first_ts else None
 
-    # Calculate total statistics
-    total_stats = Temperature.objects.filter(location=location).aggregate(
-        total_count=models.Count('id'),
-        avg_temp=models.Avg('temperature'),
-        avg_humidity=models.Avg('humidity'),
-        min_temp=models.Min('temperature'),
-        max_temp=models.Max('temperature'),
-        min_humidity=models.Min('humidity'),
-        max_humidity=models.Max('humidity')
-    )
+    # Monthly data for the last 12 months from the hourly rollup
+    month_starts = []
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(12):
+        month_starts.append(month_start)
+        # Step back to the first day of the previous month
+        month_start = (month_start - timedelta(days=1)).replace(day=1)
+    month_starts.reverse()
 
-    # Get first and last reading dates
-    first_reading = Temperature.objects.filter(location=location).order_by('timestamp').first()
+    monthly_rows = TemperatureHourly.objects.filter(
+        location=location,
+        hour__gte=month_starts[0]
+    ).annotate(
+        bucket=TruncMonth('hour')
+    ).values('bucket').annotate(
+        avg_temp=Round(
+            models.Sum('sum_temperature') / models.Sum('count'), 1
+        ),
+        avg_humidity=Round(
+            models.Sum('sum_humidity') / models.Sum('humidity_count'), 1
+        ),
+        min_temp=Round(models.Min('min_temperature'), 1),
+        max_temp=Round(models.Max('max_temperature'), 1),
+        count=models.Sum('count')
+    ).order_by('bucket')
+    monthly_by_bucket = {row['bucket']: row async for row in monthly_rows}
 
-    # Monthly data
     monthly_data = []
-    for i in range(12):
-        month_start = (now - timedelta(days=i*30)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        next_month = (month_start + timedelta(days=32)).replace(day=1)
-        month_end = next_month
-
-        month_avg = Temperature.objects.filter(
-            location=location,
-            timestamp__gte=month_start,
-            timestamp__lt=month_end
-        ).aggregate(
-            avg_temp=models.Avg('temperature'),
-            avg_humidity=models.Avg('humidity'),
-            min_temp=models.Min('temperature'),
-            max_temp=models.Max('temperature'),
-            count=models.Count('id')
-        )
+    for month_start in month_starts:
+        row = monthly_by_bucket.get(month_start)
 
         monthly_data.append({
             'month': month_start.strftime('%B %Y'),
-            'avg_temp': round(month_avg['avg_temp'], 1) if month_avg['avg_temp'] else None,
-            'avg_humidity': round(month_avg['avg_humidity'], 1) if month_avg['avg_humidity'] else None,
-            'min_temp': round(month_avg['min_temp'], 1) if month_avg['min_temp'] else None,
-            'max_temp': round(month_avg['max_temp'], 1) if month_avg['max_temp'] else None,
-            'count': month_avg['count']
+            'avg_temp': row['avg_temp'] if row else None,
+            'avg_humidity': row['avg_humidity'] if row else None,
+            'min_temp': row['min_temp'] if row else None,
+            'max_temp': row['max_temp'] if row else None,
+            'count': row['count'] if row else 0
         })
-    monthly_data.reverse()
 
     context = {
         'device_name': device_name,
@@ -212,16 +349,14 @@ def device_detail(request, device_name):
         'monthly_avg': monthly_avg,
         'daily_extremes': daily_extremes,
         'weekly_extremes': weekly_extremes,
-        'hourly_data': hourly_data,
-        'daily_data': daily_data,
-        'hourly_data_json': json.dumps(hourly_data),
-        'daily_data_json': json.dumps(daily_data),
+        'hourly_data_json': _dumps_json(hourly_data),
+        'daily_data_json': _dumps_json(daily_data),
         'recent_readings': recent_readings,
+        'recent_readings_next_before': recent_readings_next_before,
         'total_stats': total_stats,
         'first_reading': first_reading,
-        'data_age_days': (now - first_reading.timestamp).days if first_reading else 0,
-        'monthly_data': monthly_data,
-        'monthly_data_json': json.dumps(monthly_data),
+        'data_age_days': (now - first_reading['timestamp']).days if first_reading else 0,
+        'monthly_data_json': _dumps_json(monthly_data),
     }
 
-    return render(request, 'device/device.html', context)
+    return context
@@ -28,19 +28,31 @@ class TemperatureAdmin(admin.ModelAdmin):
     def export_to_csv(self, request, queryset):
         import csv
 
-        from django.http import HttpResponse
+        from django.http import StreamingHttpResponse
 
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="temperature_data.csv"'
+        class Echo:
+            """File-like object that hands csv.writer output straight back."""
 
-        writer = csv.writer(response)
-        writer.writerow(["Location", "Temperature (°C)", "Humidity (%)", "Timestamp"])
+            def write(self, value):
+                return value
 
-        for temp in queryset:
-            writer.writerow(
-                [temp.location, temp.temperature, temp.humidity or "", temp.timestamp]
-            )
+        writer = csv.writer(Echo())
 
+        def stream():
+            yield writer.writerow(
+                ["Location", "Temperature (°C)", "Humidity (%)", "Timestamp"]
+            )
+            # values_list + iterator keeps memory flat for large exports
+            rows = queryset.values_list(
+                "location", "temperature", "humidity", "timestamp"
+            ).iterator(chunk_size=2000)
+            for location, temperature, humidity, timestamp in rows:
+                yield writer.writerow(
+                    [location, temperature, humidity or "", timestamp]
+                )
+
+        response = StreamingHttpResponse(stream(), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="temperature_data.csv"'
         return response
 
     export_to_csv.short_description = "Export selected temperatures to CSV"
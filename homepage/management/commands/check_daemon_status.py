@@ -26,7 +26,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        status = get_daemon_status()
+        # CLI checks always want a fresh read of the status file
+        status = get_daemon_status(use_cache=False)
 
         if options["json"]:
             self.stdout.write(json.dumps(status, indent=2))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models.functions import TruncHour
+
+from homepage.models import Temperature, TemperatureHourly
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TemperatureHourly rollup table from raw Temperature data"
+
+    def handle(self, *args, **options):
+        # Single GROUP BY over the raw table instead of per-bucket queries
+        rows = (
+            Temperature.objects.annotate(bucket=TruncHour("timestamp"))
+            .values("location", "bucket")
+            .annotate(
+                sum_temperature=models.Sum("temperature"),
+                min_temperature=models.Min("temperature"),
+                max_temperature=models.Max("temperature"),
+                sum_humidity=models.Sum("humidity"),
+                humidity_count=models.Count("humidity"),
+                count=models.Count("id"),
+            )
+        )
+
+        with transaction.atomic():
+            TemperatureHourly.objects.all().delete()
+            TemperatureHourly.objects.bulk_create(
+                TemperatureHourly(
+                    location=row["location"],
+                    hour=row["bucket"],
+                    sum_temperature=row["sum_temperature"],
+                    min_temperature=row["min_temperature"],
+                    max_temperature=row["max_temperature"],
+                    sum_humidity=row["sum_humidity"] or 0.0,
+                    humidity_count=row["humidity_count"],
+                    count=row["count"],
+                )
+                for row in rows
+            )
+
+        rollup_count = TemperatureHourly.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rollup_count} hourly rollup buckets")
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0008_alter_device_mac_address'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TemperatureHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(db_index=True, max_length=100)),
+                ('hour', models.DateTimeField(help_text='Start of the hour bucket (UTC)')),
+                ('sum_temperature', models.FloatField(default=0.0)),
+                ('min_temperature', models.FloatField(blank=True, null=True)),
+                ('max_temperature', models.FloatField(blank=True, null=True)),
+                ('sum_humidity', models.FloatField(default=0.0)),
+                ('humidity_count', models.PositiveIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Hourly Temperature Rollup',
+                'verbose_name_plural': 'Hourly Temperature Rollups',
+                'ordering': ['-hour'],
+                'constraints': [models.UniqueConstraint(fields=('location', 'hour'), name='unique_location_hour')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0009_temperaturehourly'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='temperature',
+            constraint=models.CheckConstraint(condition=models.Q(('temperature__gte', -50.0), ('temperature__lte', 70.0)), name='temperature_within_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='temperature',
+            constraint=models.CheckConstraint(condition=models.Q(('humidity__isnull', True), models.Q(('humidity__gte', 0.0), ('humidity__lte', 100.0)), _connector='OR'), name='humidity_within_range'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0010_temperature_temperature_within_range_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='temperature',
+            name='location_slug',
+            field=models.SlugField(blank=True, help_text="URL-safe canonical form of location (e.g. 'living-room')", max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='temperature',
+            index=models.Index(fields=['location_slug', 'timestamp'], name='homepage_te_locatio_4ed03d_idx'),
+        ),
+    ]
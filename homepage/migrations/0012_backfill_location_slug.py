@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def backfill_location_slug(apps, schema_editor):
+    Temperature = apps.get_model("homepage", "Temperature")
+    # One UPDATE per distinct location instead of a per-row loop
+    locations = (
+        Temperature.objects.values_list("location", flat=True).distinct()
+    )
+    for location in locations:
+        Temperature.objects.filter(location=location).update(
+            location_slug=slugify(location)
+        )
+
+
+def clear_location_slug(apps, schema_editor):
+    Temperature = apps.get_model("homepage", "Temperature")
+    Temperature.objects.update(location_slug="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("homepage", "0011_temperature_location_slug_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location_slug, clear_location_slug),
+    ]
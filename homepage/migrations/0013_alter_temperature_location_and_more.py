@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0012_backfill_location_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='temperature',
+            name='location',
+            field=models.CharField(help_text='Location where temperature was measured', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='temperature',
+            name='location_slug',
+            field=models.SlugField(blank=True, db_index=False, help_text="URL-safe canonical form of location (e.g. 'living-room')", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='temperature',
+            name='timestamp',
+            field=models.DateTimeField(),
+        ),
+    ]
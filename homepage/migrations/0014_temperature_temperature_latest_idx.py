@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0013_alter_temperature_location_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='temperature',
+            index=models.Index(fields=['location', '-timestamp'], name='temperature_latest_idx'),
+        ),
+    ]
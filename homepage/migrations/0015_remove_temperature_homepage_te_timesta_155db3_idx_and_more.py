@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-29 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0014_temperature_temperature_latest_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='temperature',
+            name='homepage_te_timesta_155db3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='temperature',
+            index=models.Index(fields=['-timestamp'], name='homepage_te_timesta_fb64aa_idx'),
+        ),
+    ]
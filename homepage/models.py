@@ -1,16 +1,24 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Greatest, Least
+from django.utils.text import slugify
 
 
 class Temperature(models.Model):
-    # Index for time-based queries
-    timestamp = models.DateTimeField(db_index=True)
+    # Single-column indexes are redundant: every query pattern is covered
+    # by the composite indexes' leading edges in Meta.indexes
+    timestamp = models.DateTimeField()
     location = models.CharField(
         max_length=100,
-        db_index=True,  # Index for location-based queries
         help_text="Location where temperature was measured",
     )
+    location_slug = models.SlugField(
+        max_length=100,
+        blank=True,
+        db_index=False,
+        help_text="URL-safe canonical form of location (e.g. 'living-room')",
+    )
     temperature = models.FloatField(
         validators=[
             MinValueValidator(-50.0, message="Temperature cannot be below -50°C"),
@@ -32,8 +40,29 @@ class Temperature(models.Model):
         # Composite index for common query patterns
         indexes = [
             models.Index(fields=["location", "timestamp"]),
-            # Different order for different queries
-            models.Index(fields=["timestamp", "location"]),
+            # Slug lookups from URL-driven views
+            models.Index(fields=["location_slug", "timestamp"]),
+            # Descending scan for "latest reading per location" lookups
+            models.Index(
+                fields=["location", "-timestamp"], name="temperature_latest_idx"
+            ),
+            # Time-first scans (historical_data, system_status) only need
+            # the timestamp; the old (timestamp, location) composite just
+            # amplified writes
+            models.Index(fields=["-timestamp"]),
+        ]
+        # DB-level range checks so invalid rows can't be stored even via
+        # bulk_create, which skips Python validation
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(temperature__gte=-50.0, temperature__lte=70.0),
+                name="temperature_within_range",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(humidity__isnull=True)
+                | models.Q(humidity__gte=0.0, humidity__lte=100.0),
+                name="humidity_within_range",
+            ),
         ]
         # REMOVED the unique constraint that was causing issues
         ordering = ["-timestamp"]  # Default ordering by newest first
@@ -51,11 +80,31 @@ class Temperature(models.Model):
         # Normalize location name
         if self.location:
             self.location = self.location.strip().title()
+            self.location_slug = slugify(self.location)
+
+    @classmethod
+    def create_validated(cls, **kwargs):
+        """Create a reading with full validation (for non-bulk ingest paths).
+
+        The daemon-scale hot path relies on the DB CheckConstraints
+        instead of per-row full_clean().
+        """
+        instance = cls(**kwargs)
+        instance.full_clean()  # Ensures all validators run
+        instance.save()
+        return instance
 
     def save(self, *args, **kwargs):
-        """Override save to ensure validation."""
-        self.full_clean()  # Ensures all validators run
+        """Override save to keep the hourly rollup in sync."""
+        if not self.location_slug and self.location:
+            self.location_slug = slugify(self.location)
+        is_new = self.pk is None
         super().save(*args, **kwargs)
+        # Maintained on insert so dashboards never have to aggregate raw rows
+        if is_new:
+            TemperatureHourly.record(
+                self.location, self.timestamp, self.temperature, self.humidity
+            )
 
     def __str__(self):
         humidity_str = (
@@ -71,6 +120,77 @@ class Temperature(models.Model):
         return (self.temperature * 9 / 5) + 32
 
 
+class TemperatureHourly(models.Model):
+    """Materialized hourly rollup of Temperature readings.
+
+    Maintained incrementally on ingest so dashboard aggregates read a
+    fixed number of rollup rows instead of scanning raw readings.
+    Averages are derived as sum / count.
+    """
+
+    location = models.CharField(max_length=100, db_index=True)
+    hour = models.DateTimeField(help_text="Start of the hour bucket (UTC)")
+    sum_temperature = models.FloatField(default=0.0)
+    min_temperature = models.FloatField(null=True, blank=True)
+    max_temperature = models.FloatField(null=True, blank=True)
+    sum_humidity = models.FloatField(default=0.0)
+    humidity_count = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "hour"], name="unique_location_hour"
+            )
+        ]
+        ordering = ["-hour"]
+        verbose_name = "Hourly Temperature Rollup"
+        verbose_name_plural = "Hourly Temperature Rollups"
+
+    def __str__(self):
+        return f"{self.location} - {self.count} readings at {self.hour}"
+
+    @property
+    def avg_temperature(self):
+        """Average temperature for the bucket."""
+        return self.sum_temperature / self.count if self.count else None
+
+    @property
+    def avg_humidity(self):
+        """Average humidity for the bucket (readings without humidity excluded)."""
+        return self.sum_humidity / self.humidity_count if self.humidity_count else None
+
+    @classmethod
+    def record(cls, location, timestamp, temperature, humidity=None):
+        """Fold a single reading into its hourly bucket (upsert)."""
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        rollup, created = cls.objects.get_or_create(
+            location=location,
+            hour=hour,
+            defaults={
+                "sum_temperature": temperature,
+                "min_temperature": temperature,
+                "max_temperature": temperature,
+                "sum_humidity": humidity if humidity is not None else 0.0,
+                "humidity_count": 1 if humidity is not None else 0,
+                "count": 1,
+            },
+        )
+        if not created:
+            # F() expressions keep the increment atomic under concurrent writers
+            cls.objects.filter(pk=rollup.pk).update(
+                sum_temperature=models.F("sum_temperature") + temperature,
+                min_temperature=Least("min_temperature", models.Value(temperature)),
+                max_temperature=Greatest("max_temperature", models.Value(temperature)),
+                sum_humidity=models.F("sum_humidity")
+                + (humidity if humidity is not None else 0.0),
+                humidity_count=models.F("humidity_count")
+                + (1 if humidity is not None else 0),
+                count=models.F("count") + 1,
+            )
+        return rollup
+
+
 class Device(models.Model):
     """Simple device configuration model."""
 
@@ -1,431 +1,365 @@
 """
 Tests for the temperature daemon functionality.
-"""
 
-import os
-import tempfile
-from unittest.mock import MagicMock, patch
+Written pytest-style (fixtures + monkeypatch) so the module can be
+sharded across cores with ``pytest -n auto``; only the storage tests
+need the database, the rest stay DB-free.
+"""
 
-from django.test import TestCase
+import pytest
 
 from homepage.models import Temperature
-from homepage.test_utils import MockSwitchBot, MockSwitchBotDevice, MockSwitchBotService
-
-
-class TemperatureDaemonTestCase(TestCase):
-    """Base test case for daemon tests."""
-
-    def setUp(self):
-        """Set up test environment."""
-        # Mock environment variables
-        self.env_patcher = patch.dict(
-            os.environ,
-            {
-                "SWITCHBOT_TOKEN": "test_token",
-                "SWITCHBOT_SECRET": "test_secret",
-                "LIVING_ROOM_MAC": "MAC001",
-                "BEDROOM_MAC": "MAC002",
-                "OFFICE_MAC": "MAC003",
-                "OUTDOOR_MAC": "MAC004",
-                "TEMPERATURE_INTERVAL": "60",
-            },
-        )
-        self.env_patcher.start()
-
-        # Create a temporary log file for testing
-        self.temp_log = tempfile.NamedTemporaryFile(delete=False, suffix=".log")
-        self.temp_log_path = self.temp_log.name
-        self.temp_log.close()
-
-    def tearDown(self):
-        """Clean up test environment."""
-        self.env_patcher.stop()
-
-        # Clean up temporary log file
-        try:
-            os.unlink(self.temp_log_path)
-        except FileNotFoundError:
-            pass
+from homepage.test_utils import MockSwitchBotService
+
+# Safe to import once at module scope: the daemon skips django.setup()
+# under the test runner, and patches only need to be active when a
+# daemon is constructed, not when the class is imported.
+from scripts.temperature_daemon import TemperatureDaemon
+
+# Baseline daemon environment used by most tests
+DAEMON_ENV = {
+    "SWITCHBOT_TOKEN": "test_token",
+    "SWITCHBOT_SECRET": "test_secret",
+    "LIVING_ROOM_MAC": "MAC001",
+    "BEDROOM_MAC": "MAC002",
+    "OFFICE_MAC": "MAC003",
+    "OUTDOOR_MAC": "MAC004",
+    "TEMPERATURE_INTERVAL": "60",
+}
+
+DEVICE_MAC_KEYS = ("LIVING_ROOM_MAC", "BEDROOM_MAC", "OFFICE_MAC", "OUTDOOR_MAC")
+
+# MAC fallbacks baked into services.switchbot_service.get_device_configs
+DEFAULT_MACS = {
+    "living_room_thermometer": "D40E84863006",
+    "bedroom_thermometer": "D40E84861814",
+    "office_thermometer": "D628EA1C498F",
+    "outdoor_thermometer": "D40E84064570",
+}
+
+CUSTOM_MAC_ENV = {
+    "LIVING_ROOM_MAC": "CUSTOM001",
+    "BEDROOM_MAC": "CUSTOM002",
+    "OFFICE_MAC": "CUSTOM003",
+    "OUTDOOR_MAC": "CUSTOM004",
+}
+
+CUSTOM_MACS = {
+    "living_room_thermometer": "CUSTOM001",
+    "bedroom_thermometer": "CUSTOM002",
+    "office_thermometer": "CUSTOM003",
+    "outdoor_thermometer": "CUSTOM004",
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def daemon_env():
+    """Apply the baseline daemon environment once for the whole module.
+
+    Tests override or delete individual keys through their own
+    monkeypatch, which restores just those keys afterwards, so the
+    baseline never needs re-applying per test.
+    """
+    mp = pytest.MonkeyPatch()
+    for key, value in DAEMON_ENV.items():
+        mp.setenv(key, value)
+    yield
+    mp.undo()
+
+
+@pytest.fixture
+def service_factory(mocker):
+    """Patch the SwitchBot service factory for daemon construction,
+    returning the factory mock.
+
+    django.setup() no longer needs patching: the daemon module skips it
+    when Django is already configured, as it is under the test runner.
+    """
+    return mocker.patch("scripts.temperature_daemon.get_switchbot_service")
+
+
+@pytest.fixture(scope="module")
+def stub_service():
+    """One reusable service stand-in for initialization tests.
+
+    Those tests only assert on configuration and factory calls, never
+    read from the service, so a single shared instance is safe.
+    """
+    return MockSwitchBotService()
+
+
+# One healthy (temperature, humidity) reading per device MAC
+_DEFAULT_DEVICE_SEED = {
+    "MAC001": (22.5, 65.0),  # Living Room
+    "MAC002": (21.0, 58.0),  # Bedroom
+    "MAC003": (23.5, 62.0),  # Office
+    "MAC004": (15.5, 85.0),  # Outdoor
+}
+
+
+def _seed_service(service, seed=_DEFAULT_DEVICE_SEED):
+    """(Re)seed the mock service and clear any injected failures."""
+    for mac, (temperature, humidity) in seed.items():
+        service.set_device_data(mac, temperature, humidity)
+        service.set_device_failure(mac, False)
+
+
+@pytest.fixture(scope="class")
+def shared_daemon(class_mocker):
+    """Construct the daemon and its mock service once per test class.
+
+    Building a TemperatureDaemon means starting a patcher, seeding four
+    devices and importing the daemon module — doing that per test
+    dominated this file's runtime, so it happens once here.
+    """
+    mp = pytest.MonkeyPatch()
+    mp.setenv("ENVIRONMENT", "test")
+
+    service = MockSwitchBotService()
+    _seed_service(service)
+
+    class_mocker.patch(
+        "scripts.temperature_daemon.get_switchbot_service", return_value=service
+    )
+    yield TemperatureDaemon(), service
+    mp.undo()
+
+
+@pytest.fixture
+def daemon(shared_daemon):
+    """The class-scoped daemon, with mock state reset after each test."""
+    daemon, service = shared_daemon
+    yield daemon
+    _seed_service(service)
+
+
+@pytest.fixture
+def mock_service(shared_daemon):
+    """The mock service backing the class-scoped daemon."""
+    return shared_daemon[1]
 
 
-class TemperatureDaemonInitializationTests(TemperatureDaemonTestCase):
+class TestTemperatureDaemonInitialization:
     """Test daemon initialization."""
 
-    def test_daemon_initialization_success_production(self):
-        """Test successful daemon initialization in production environment."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service
-                mock_service = MockSwitchBotService()
-                mock_service_factory.return_value = mock_service
-
-                # Ensure production environment
-                with patch.dict(os.environ, {"ENVIRONMENT": "production"}):
-                    daemon = TemperatureDaemon()
-
-                # Verify initialization
-                self.assertTrue(daemon.running)
-                self.assertEqual(daemon.interval, 60)
-                self.assertEqual(len(daemon.devices), 4)
-                # Verify service factory was called
-                mock_service_factory.assert_called_once()
-
-    def test_daemon_initialization_success_preprod(self):
-        """Test successful daemon initialization in preprod environment."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service
-                mock_service = MockSwitchBotService()
-                mock_service_factory.return_value = mock_service
-
-                # Ensure preprod environment
-                with patch.dict(os.environ, {"ENVIRONMENT": "preprod"}):
-                    daemon = TemperatureDaemon()
-
-                # Verify initialization
-                self.assertTrue(daemon.running)
-                self.assertEqual(daemon.interval, 60)
-                self.assertEqual(len(daemon.devices), 4)
-                # Verify service factory was called
-                mock_service_factory.assert_called_once()
-
-    def test_daemon_initialization_missing_credentials(self):
+    @pytest.mark.parametrize("environment", ["production", "preprod"])
+    def test_daemon_initialization_success(
+        self, service_factory, stub_service, monkeypatch, environment
+    ):
+        """Test successful daemon initialization in each environment."""
+        service_factory.return_value = stub_service
+        monkeypatch.setenv("ENVIRONMENT", environment)
+
+        daemon = TemperatureDaemon()
+
+        # Verify initialization
+        assert daemon.running
+        assert daemon.interval == 60
+        assert len(daemon.devices) == 4
+        # Verify service factory was called
+        service_factory.assert_called_once()
+
+    def test_daemon_initialization_missing_credentials(
+        self, service_factory, monkeypatch
+    ):
         """Test daemon initialization with missing credentials."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service factory to raise ValueError for missing credentials
-                mock_service_factory.side_effect = ValueError(
-                    "SWITCHBOT_TOKEN and SWITCHBOT_SECRET must be set in environment variables"
-                )
-
-                # Remove credentials from environment
-                with patch.dict(os.environ, {}, clear=True):
-                    with patch.dict(os.environ, {"ENVIRONMENT": "production"}):
-                        with self.assertRaises(ValueError) as context:
-                            TemperatureDaemon()
-
-                        self.assertIn(
-                            "SWITCHBOT_TOKEN and SWITCHBOT_SECRET must be set",
-                            str(context.exception),
-                        )
-
-    def test_daemon_initialization_with_default_macs(self):
-        """Test daemon initialization with default MAC addresses."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service
-                mock_service = MockSwitchBotService()
-                mock_service_factory.return_value = mock_service
-
-                # Remove all MAC environment variables to test defaults
-                with patch.dict(os.environ, {}, clear=True):
-                    with patch.dict(
-                        os.environ,
-                        {
-                            "SWITCHBOT_TOKEN": "test_token",
-                            "SWITCHBOT_SECRET": "test_secret",
-                            "ENVIRONMENT": "production",
-                        },
-                    ):
-                        daemon = TemperatureDaemon()
-
-                # Verify default MAC addresses are used
-                expected_devices = {
-                    "living_room_thermometer": "D40E84863006",
-                    "bedroom_thermometer": "D40E84861814",
-                    "office_thermometer": "D628EA1C498F",
-                    "outdoor_thermometer": "D40E84064570",
-                }
-                self.assertEqual(daemon.devices, expected_devices)
-
-    def test_daemon_initialization_with_custom_macs(self):
-        """Test daemon initialization with custom MAC addresses from environment."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service
-                mock_service = MockSwitchBotService()
-                mock_service_factory.return_value = mock_service
-
-                # Set custom MAC addresses
-                custom_env = {
-                    "SWITCHBOT_TOKEN": "test_token",
-                    "SWITCHBOT_SECRET": "test_secret",
-                    "ENVIRONMENT": "production",
-                    "LIVING_ROOM_MAC": "CUSTOM001",
-                    "BEDROOM_MAC": "CUSTOM002",
-                    "OFFICE_MAC": "CUSTOM003",
-                    "OUTDOOR_MAC": "CUSTOM004",
-                }
-
-                with patch.dict(os.environ, custom_env):
-                    daemon = TemperatureDaemon()
-
-                # Verify custom MAC addresses are used
-                expected_devices = {
-                    "living_room_thermometer": "CUSTOM001",
-                    "bedroom_thermometer": "CUSTOM002",
-                    "office_thermometer": "CUSTOM003",
-                    "outdoor_thermometer": "CUSTOM004",
-                }
-                self.assertEqual(daemon.devices, expected_devices)
-
-    def test_device_configuration_structure(self):
-        """Test that device configuration has the expected structure."""
-        # Import here to avoid Django configuration issues
-        with patch("scripts.temperature_daemon.django.setup"):
-            with patch(
-                "scripts.temperature_daemon.get_switchbot_service"
-            ) as mock_service_factory:
-                from scripts.temperature_daemon import TemperatureDaemon
-
-                # Mock service
-                mock_service = MockSwitchBotService()
-                mock_service_factory.return_value = mock_service
-
-                daemon = TemperatureDaemon()
-
-                # Verify all expected devices are present
-                expected_device_names = {
-                    "living_room_thermometer",
-                    "bedroom_thermometer",
-                    "office_thermometer",
-                    "outdoor_thermometer",
-                }
-                self.assertEqual(set(daemon.devices.keys()), expected_device_names)
-
-                # Verify all MAC addresses are strings
-                for device_name, mac_address in daemon.devices.items():
-                    self.assertIsInstance(mac_address, str)
-                    self.assertTrue(
-                        len(mac_address) > 0,
-                        f"MAC address for {device_name} should not be empty",
-                    )
-
-
-class TemperatureDaemonDataCollectionTests(TemperatureDaemonTestCase):
-    """Test daemon data collection functionality."""
-
-    def setUp(self):
-        """Set up daemon for testing."""
-        super().setUp()
-
-        # Import and patch here to avoid import issues
-        self.django_setup_patcher = patch("scripts.temperature_daemon.django.setup")
-        self.django_setup_patcher.start()
-
-        # Import after patching
-        from homepage.test_utils import MockSwitchBotService
-
-        # Create mock service with test data
-        self.mock_service = MockSwitchBotService()
-        self.mock_service.set_device_data("MAC001", 22.5, 65.0)  # Living Room
-        self.mock_service.set_device_data("MAC002", 21.0, 58.0)  # Bedroom
-        self.mock_service.set_device_data("MAC003", 23.5, 62.0)  # Office
-        self.mock_service.set_device_data("MAC004", 15.5, 85.0)  # Outdoor
-
-        # Patch the service factory to return our mock
-        self.switchbot_service_patcher = patch(
-            "scripts.temperature_daemon.get_switchbot_service"
+        # Mock service factory to raise ValueError for missing credentials
+        service_factory.side_effect = ValueError(
+            "SWITCHBOT_TOKEN and SWITCHBOT_SECRET must be set in environment variables"
         )
 
-        mock_service_factory = self.switchbot_service_patcher.start()
-        mock_service_factory.return_value = self.mock_service
-
-        # Create daemon with test environment
-        with patch.dict(os.environ, {"ENVIRONMENT": "test"}):
-            from scripts.temperature_daemon import TemperatureDaemon
+        # Remove credentials from environment
+        monkeypatch.delenv("SWITCHBOT_TOKEN", raising=False)
+        monkeypatch.delenv("SWITCHBOT_SECRET", raising=False)
+        monkeypatch.setenv("ENVIRONMENT", "production")
+
+        with pytest.raises(ValueError, match="SWITCHBOT_TOKEN and SWITCHBOT_SECRET"):
+            TemperatureDaemon()
+
+    @pytest.mark.parametrize(
+        "extra_env,expected_macs",
+        [
+            ({}, DEFAULT_MACS),
+            (CUSTOM_MAC_ENV, CUSTOM_MACS),
+        ],
+        ids=["default_macs", "custom_macs"],
+    )
+    def test_daemon_initialization_device_macs(
+        self, service_factory, stub_service, monkeypatch, extra_env, expected_macs
+    ):
+        """Test device MAC resolution with and without env overrides."""
+        service_factory.return_value = stub_service
+
+        monkeypatch.setenv("ENVIRONMENT", "production")
+        # Start from a clean slate so the defaults case really tests defaults
+        for key in DEVICE_MAC_KEYS:
+            monkeypatch.delenv(key, raising=False)
+        for key, value in extra_env.items():
+            monkeypatch.setenv(key, value)
+
+        daemon = TemperatureDaemon()
+
+        assert daemon.devices == expected_macs
+
+    def test_device_configuration_structure(self, service_factory, stub_service):
+        """Test that device configuration has the expected structure."""
+        service_factory.return_value = stub_service
+
+        daemon = TemperatureDaemon()
+
+        # Verify all expected devices are present
+        expected_device_names = {
+            "living_room_thermometer",
+            "bedroom_thermometer",
+            "office_thermometer",
+            "outdoor_thermometer",
+        }
+        assert set(daemon.devices.keys()) == expected_device_names
+
+        # Verify all MAC addresses are non-empty strings
+        for device_name, mac_address in daemon.devices.items():
+            assert isinstance(mac_address, str)
+            assert len(mac_address) > 0, (
+                f"MAC address for {device_name} should not be empty"
+            )
 
-            self.daemon = TemperatureDaemon()
 
-    def tearDown(self):
-        """Clean up patches."""
-        self.switchbot_service_patcher.stop()
-        self.django_setup_patcher.stop()
-        super().tearDown()
+class TestTemperatureDaemonDataCollection:
+    """Test daemon data collection functionality."""
 
-    def test_get_temperature_success(self):
+    def test_get_temperature_success(self, daemon):
         """Test successful temperature reading."""
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertEqual(temperature, 22.5)
+        assert daemon.get_temperature("living_room_thermometer") == 22.5
 
-    def test_get_humidity_success(self):
+    def test_get_humidity_success(self, daemon):
         """Test successful humidity reading."""
-        humidity = self.daemon.get_humidity("living_room_thermometer")
-        self.assertEqual(humidity, 65.0)
+        assert daemon.get_humidity("living_room_thermometer") == 65.0
 
-    def test_get_temperature_device_not_found(self):
+    def test_get_temperature_device_not_found(self, daemon):
         """Test temperature reading from non-existent device."""
-        temperature = self.daemon.get_temperature("nonexistent_device")
-        self.assertIsNone(temperature)
-
-    def test_get_temperature_device_failure(self):
-        """Test temperature reading when device fails."""
+        assert daemon.get_temperature("nonexistent_device") is None
+
+    @pytest.mark.parametrize(
+        "failure_reason",
+        [
+            "Device communication error",
+            "Authentication error",
+            "Rate limit exceeded",
+        ],
+    )
+    def test_get_temperature_device_failure(
+        self, daemon, mock_service, failure_reason
+    ):
+        """Test temperature reading for each failure mode, then recovery."""
         # Make device fail
-        self.mock_service.set_device_failure(
-            "MAC001", True, "Device communication error"
-        )
+        mock_service.set_device_failure("MAC001", True, failure_reason)
+
+        assert daemon.get_temperature("living_room_thermometer") is None
 
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertIsNone(temperature)
+        # After clearing the failure, should work again
+        mock_service.set_device_failure("MAC001", False)
+        assert daemon.get_temperature("living_room_thermometer") == 22.5
 
-    def test_get_temperature_invalid_range(self):
+    def test_get_temperature_invalid_range(self, daemon, mock_service):
         """Test temperature reading with out-of-range values."""
         # Set invalid temperature
-        self.mock_service.set_device_data("MAC001", -60.0, 50.0)
+        mock_service.set_device_data("MAC001", -60.0, 50.0)
 
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertIsNone(temperature)
+        assert daemon.get_temperature("living_room_thermometer") is None
 
-    def test_get_humidity_invalid_range(self):
+    def test_get_humidity_invalid_range(self, daemon, mock_service):
         """Test humidity reading with out-of-range values."""
         # Set invalid humidity
-        self.mock_service.set_device_data("MAC001", 20.0, 150.0)
-
-        humidity = self.daemon.get_humidity("living_room_thermometer")
-        self.assertIsNone(humidity)
+        mock_service.set_device_data("MAC001", 20.0, 150.0)
 
-    def test_get_temperature_auth_error_recovery(self):
-        """Test temperature reading with authentication error recovery."""
-        # Make service return None to simulate auth error recovery
-        self.mock_service.set_device_failure("MAC001", True, "Authentication error")
+        assert daemon.get_humidity("living_room_thermometer") is None
 
-        # Should return None on auth error
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertIsNone(temperature)
 
-    def test_get_temperature_rate_limit_handling(self):
-        """Test temperature reading with rate limit error handling."""
-        # Simulate rate limit by making service fail initially
-        self.mock_service.set_device_failure("MAC001", True, "Rate limit exceeded")
+class TestTemperatureDaemonStorage:
+    """Test daemon database storage; the only tests here that need the ORM."""
 
-        # Should return None when rate limited
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertIsNone(temperature)
+    pytestmark = pytest.mark.django_db
 
-        # After clearing the failure, should work again
-        self.mock_service.set_device_failure("MAC001", False)
-        temperature = self.daemon.get_temperature("living_room_thermometer")
-        self.assertEqual(temperature, 22.5)
-
-    def test_store_temperature_success(self):
+    def test_store_temperature_success(self, daemon, django_assert_num_queries):
         """Test successful temperature storage."""
-        success = self.daemon.store_temperature("living_room_thermometer", 22.5, 65.0)
+        # Guard against silent N+1 creep. The current cost: constraint
+        # checks from full_clean, the reading INSERT, the hourly-rollup
+        # upsert (SELECT + INSERT), and the savepoints wrapping them.
+        with django_assert_num_queries(13):
+            success = daemon.store_temperature("living_room_thermometer", 22.5, 65.0)
 
-        self.assertTrue(success)
+        assert success
 
-        # Verify record was created
-        temp_record = Temperature.objects.filter(location="Living Room").first()
-        self.assertIsNotNone(temp_record)
-        if temp_record:
-            self.assertEqual(temp_record.temperature, 22.5)
-            self.assertEqual(temp_record.humidity, 65.0)
+        # Verify record was created; get() fails loudly on duplicates
+        temp_record = Temperature.objects.get(location="Living Room")
+        assert temp_record.temperature == 22.5
+        assert temp_record.humidity == 65.0
 
-    def test_store_temperature_invalid_type(self):
+    def test_store_temperature_invalid_type(self, daemon):
         """Test temperature storage with invalid data types."""
         # This would raise an exception in real code, but we'll test the behavior
         try:
-            success = self.daemon.store_temperature(
+            success = daemon.store_temperature(
                 "living_room_thermometer", "invalid_string", 65.0  # type: ignore
             )
-            self.assertFalse(success)
+            assert not success
         except (TypeError, ValueError):
             # Exception is acceptable for invalid input
             pass
 
-        self.assertEqual(Temperature.objects.count(), 0)
+        assert Temperature.objects.count() == 0
 
-    def test_store_temperature_unknown_device(self):
+    def test_store_temperature_unknown_device(self, daemon):
         """Test temperature storage for unknown device."""
-        success = self.daemon.store_temperature("unknown_device", 22.5, 65.0)
+        success = daemon.store_temperature("unknown_device", 22.5, 65.0)
 
         # Should still succeed but log warning
-        self.assertTrue(success)
+        assert success
 
         temp_record = Temperature.objects.first()
-        self.assertIsNotNone(temp_record)
-        if temp_record:
-            self.assertEqual(temp_record.location, "Unknown")
+        assert temp_record is not None
+        assert temp_record.location == "Unknown"
 
 
-class TemperatureDaemonMainLoopTests(TemperatureDaemonTestCase):
+class TestTemperatureDaemonMainLoop:
     """Test daemon main loop functionality."""
 
-    def test_daemon_environment_service_selection(self):
+    def test_daemon_environment_service_selection(
+        self, service_factory, monkeypatch
+    ):
         """Test that daemon selects correct service based on environment."""
-        with patch("scripts.temperature_daemon.django.setup"):
-            from scripts.temperature_daemon import TemperatureDaemon
-
-            # Test production environment
-            with patch.dict(os.environ, {"ENVIRONMENT": "production"}):
-                with patch(
-                    "scripts.temperature_daemon.get_switchbot_service"
-                ) as mock_factory:
-                    _ = TemperatureDaemon()
-                    mock_factory.assert_called_once()
-
-            # Test preprod environment
-            with patch.dict(os.environ, {"ENVIRONMENT": "preprod"}):
-                with patch(
-                    "scripts.temperature_daemon.get_switchbot_service"
-                ) as mock_factory:
-                    _ = TemperatureDaemon()
-                    mock_factory.assert_called_once()
+        # Test production environment
+        monkeypatch.setenv("ENVIRONMENT", "production")
+        _ = TemperatureDaemon()
+        service_factory.assert_called_once()
+
+        # Test preprod environment
+        service_factory.reset_mock()
+        monkeypatch.setenv("ENVIRONMENT", "preprod")
+        _ = TemperatureDaemon()
+        service_factory.assert_called_once()
 
     def test_preprod_service_returns_random_values(self):
-        """Test that PreProdSwitchBotService returns random values."""
-        with patch("scripts.temperature_daemon.django.setup"):
-            from services.switchbot_service import PreProdSwitchBotService
-
-            service = PreProdSwitchBotService()
-
-            # Test multiple calls to ensure randomness
-            temps = [service.get_temperature("test_mac") for _ in range(5)]
-            humidities = [service.get_humidity("test_mac") for _ in range(5)]
-
-            # All values should be non-None
-            self.assertTrue(all(t is not None for t in temps))
-            self.assertTrue(all(h is not None for h in humidities))
-
-            # Values should be in expected ranges
-            for temp in temps:
-                if temp is not None:
-                    self.assertGreaterEqual(temp, 18.0)
-                    self.assertLessEqual(temp, 25.0)
-
-            for humidity in humidities:
-                if humidity is not None:
-                    self.assertGreaterEqual(humidity, 30.0)
-                    self.assertLessEqual(humidity, 50.0)
-
-            # Test device status method
-            status = service.get_device_status("test_mac")
-            self.assertIsNotNone(status)
-            if status is not None:
-                self.assertIn("temperature", status)
-                self.assertIn("humidity", status)
-                self.assertIn("battery", status)
+        """Test that PreProdSwitchBotService returns in-range random values."""
+        import random
+
+        from services.switchbot_service import PreProdSwitchBotService
+
+        # Seed so failures reproduce; the range assertions hold for any seed
+        random.seed(0)
+        service = PreProdSwitchBotService()
+
+        temp = service.get_temperature("test_mac")
+        assert temp is not None
+        assert 18.0 <= temp <= 25.0
+
+        humidity = service.get_humidity("test_mac")
+        assert humidity is not None
+        assert 30.0 <= humidity <= 50.0
+
+        # Test device status method
+        status = service.get_device_status("test_mac")
+        assert status is not None
+        assert "temperature" in status
+        assert "humidity" in status
+        assert "battery" in status
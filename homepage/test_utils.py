@@ -2,11 +2,13 @@
 Test utilities and fixtures for the temperature monitoring system.
 """
 
+from dataclasses import dataclass
 from datetime import timedelta
 from typing import Optional
 from unittest.mock import MagicMock
 
 from django.utils import timezone
+from django.utils.text import slugify
 
 from homepage.models import Temperature
 
@@ -14,6 +16,13 @@ from homepage.models import Temperature
 class MockSwitchBotService:
     """Mock SwitchBot service for testing."""
 
+    __slots__ = (
+        "temperature_values",
+        "humidity_values",
+        "should_fail",
+        "failure_messages",
+    )
+
     def __init__(self):
         self.temperature_values = {}
         self.humidity_values = {}
@@ -63,10 +72,19 @@ class MockSwitchBotService:
         self.should_fail[mac_address] = should_fail
         self.failure_messages[mac_address] = message
 
+    def reset(self):
+        """Clear all device data and failures so the instance can be reused."""
+        self.temperature_values.clear()
+        self.humidity_values.clear()
+        self.should_fail.clear()
+        self.failure_messages.clear()
+
 
 class MockTestSwitchBotService(MockSwitchBotService):
     """Test service that returns None by default (for testing failure scenarios)."""
 
+    __slots__ = ()
+
     def get_temperature(self, mac_address: str) -> Optional[float]:
         return None
 
@@ -97,56 +115,103 @@ class TemperatureTestMixin:
 
     @staticmethod
     def create_temperature_series(
-        location, count=5, base_temperature=20.0, base_humidity=50.0, interval_minutes=5
+        location,
+        count=5,
+        base_temperature=20.0,
+        base_humidity=50.0,
+        interval_minutes=5,
+        base_time=None,
     ):
         """Create a series of temperature readings for testing."""
-        temperatures = []
-        base_time = timezone.now()
-
-        for i in range(count):
-            temp = Temperature.objects.create(
-                timestamp=base_time - timedelta(minutes=i * interval_minutes),
-                location=location,
-                temperature=base_temperature + i,
-                humidity=base_humidity + i if base_humidity else None,
-            )
-            temperatures.append(temp)
-
-        return temperatures
+        if base_time is None:
+            base_time = timezone.now()
+
+        # One INSERT for the whole series; bulk_create skips save(), so
+        # set the slug explicitly
+        return Temperature.objects.bulk_create(
+            [
+                Temperature(
+                    timestamp=base_time - timedelta(minutes=i * interval_minutes),
+                    location=location,
+                    location_slug=slugify(location),
+                    temperature=base_temperature + i,
+                    humidity=base_humidity + i if base_humidity else None,
+                )
+                for i in range(count)
+            ],
+            batch_size=500,
+        )
 
     @staticmethod
-    def create_multi_location_data():
+    def create_multi_location_data(base_time=None):
         """Create test data for multiple locations."""
         locations = ["Living Room", "Bedroom", "Office", "Outdoor"]
-        temperatures = []
-        base_time = timezone.now()
+        if base_time is None:
+            base_time = timezone.now()
 
+        objs = []
         for i, location in enumerate(locations):
-            # Create current reading
-            temp = Temperature.objects.create(
-                timestamp=base_time - timedelta(minutes=i),
-                location=location,
-                temperature=20.0 + i * 2,
-                humidity=50.0 + i * 5,
+            slug = slugify(location)
+            # Current reading
+            objs.append(
+                Temperature(
+                    timestamp=base_time - timedelta(minutes=i),
+                    location=location,
+                    location_slug=slug,
+                    temperature=20.0 + i * 2,
+                    humidity=50.0 + i * 5,
+                )
             )
-            temperatures.append(temp)
-
-            # Create some historical data
-            for j in range(1, 4):
-                historical_temp = Temperature.objects.create(
+            # Some historical data
+            objs.extend(
+                Temperature(
                     timestamp=base_time - timedelta(hours=j, minutes=i),
                     location=location,
+                    location_slug=slug,
                     temperature=20.0 + i * 2 - j,
                     humidity=50.0 + i * 5 - j * 2,
                 )
-                temperatures.append(historical_temp)
+                for j in range(1, 4)
+            )
+
+        # Single INSERT instead of 16 round trips
+        return Temperature.objects.bulk_create(objs, batch_size=500)
+
 
-        return temperatures
+class TemperatureReadOnlyDataMixin(TemperatureTestMixin):
+    """Mixin that builds the multi-location dataset once per TestCase class.
+
+    Rows are created in setUpTestData, so every test in the class shares
+    one savepoint instead of re-inserting 16 rows per test. Treat the
+    rows as read-only: tests that mutate or delete them must create
+    their own data in setUp instead.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Freeze the reference time so assertions don't chase per-test
+        # timezone.now() drift
+        cls.data_base_time = timezone.now()
+        cls.multi_location_data = cls.create_multi_location_data(
+            base_time=cls.data_base_time
+        )
 
 
 class MockSwitchBotDevice:
     """Mock SwitchBot device for testing."""
 
+    __slots__ = (
+        "temperature",
+        "humidity",
+        "battery",
+        "device_id",
+        "device_type",
+        "_should_fail",
+        "_failure_exc",
+        "_status",
+    )
+
     def __init__(
         self,
         temperature="22.5",
@@ -161,31 +226,36 @@ class MockSwitchBotDevice:
         self.device_id = device_id
         self.device_type = device_type
         self._should_fail = False
-        self._failure_message = "Mock device error"
+        self._failure_exc = Exception("Mock device error")
+        # Built once; status() is called thousands of times in loop tests
+        self._status = {
+            "version": "V0.9",
+            "temperature": temperature,
+            "battery": battery,
+            "humidity": humidity,
+            "device_id": device_id,
+            "device_type": device_type,
+        }
 
     def status(self):
         """Return mock device status."""
         if self._should_fail:
-            raise Exception(self._failure_message)
-
-        return {
-            "version": "V0.9",
-            "temperature": self.temperature,
-            "battery": self.battery,
-            "humidity": self.humidity,
-            "device_id": self.device_id,
-            "device_type": self.device_type,
-        }
+            # Reuse the prebuilt exception; failure-loop tests raise
+            # this many times per cycle
+            raise self._failure_exc from None
+        return self._status
 
     def set_failure(self, should_fail=True, message="Mock device error"):
         """Configure the mock device to fail."""
         self._should_fail = should_fail
-        self._failure_message = message
+        self._failure_exc = Exception(message)
 
 
 class MockSwitchBot:
     """Mock SwitchBot class for testing."""
 
+    __slots__ = ("token", "secret", "devices", "_should_fail_auth")
+
     def __init__(self, token=None, secret=None):
         self.token = token
         self.secret = secret
@@ -193,15 +263,17 @@ class MockSwitchBot:
         self._should_fail_auth = False
 
     def device(self, id):
-        """Return a mock device."""
+        """Return a mock device, memoizing defaults for unseen ids."""
         if self._should_fail_auth:
             raise Exception("SwitchBot API server returns status 401")
 
-        if id in self.devices:
-            return self.devices[id]
-
-        # Return a default mock device
-        return MockSwitchBotDevice(device_id=id)
+        device = self.devices.get(id)
+        if device is None:
+            # Create the default device once so repeat lookups return
+            # the same instance
+            device = MockSwitchBotDevice(device_id=id)
+            self.devices[id] = device
+        return device
 
     def add_device(self, device_id, mock_device):
         """Add a mock device to the SwitchBot instance."""
@@ -212,48 +284,34 @@ class MockSwitchBot:
         self._should_fail_auth = should_fail
 
 
-# Test data constants
-SAMPLE_TEMPERATURE_DATA = [
-    {
-        "location": "Living Room",
-        "temperature": 22.5,
-        "humidity": 65.0,
-        "timestamp": None,  # Will be set to timezone.now() when used
-    },
-    {"location": "Bedroom", "temperature": 21.0, "humidity": 58.0, "timestamp": None},
-    {"location": "Office", "temperature": 23.5, "humidity": 62.0, "timestamp": None},
-    {"location": "Outdoor", "temperature": 15.5, "humidity": 85.0, "timestamp": None},
-]
-
-INVALID_TEMPERATURE_DATA = [
-    {
-        "temperature": -60.0,  # Too low
-        "location": "Test",
-        "humidity": 50.0,
-        "error": "temperature_too_low",
-    },
-    {
-        "temperature": 80.0,  # Too high
-        "location": "Test",
-        "humidity": 50.0,
-        "error": "temperature_too_high",
-    },
-    {
-        "temperature": 20.0,
-        "location": "Test",
-        "humidity": -5.0,  # Too low
-        "error": "humidity_too_low",
-    },
-    {
-        "temperature": 20.0,
-        "location": "Test",
-        "humidity": 105.0,  # Too high
-        "error": "humidity_too_high",
-    },
-    {
-        "temperature": 20.0,
-        "location": "   ",  # Empty location
-        "humidity": 50.0,
-        "error": "empty_location",
-    },
-]
+# Test data constants; frozen slotted records are cheap to iterate in
+# parametrized tests (no per-row dict rebuild) and hashable for reuse
+@dataclass(frozen=True, slots=True)
+class SampleReading:
+    location: str
+    temperature: float
+    humidity: float
+
+
+@dataclass(frozen=True, slots=True)
+class InvalidReading:
+    location: str
+    temperature: float
+    humidity: float
+    error: str
+
+
+SAMPLE_TEMPERATURE_DATA = (
+    SampleReading("Living Room", 22.5, 65.0),
+    SampleReading("Bedroom", 21.0, 58.0),
+    SampleReading("Office", 23.5, 62.0),
+    SampleReading("Outdoor", 15.5, 85.0),
+)
+
+INVALID_TEMPERATURE_DATA = (
+    InvalidReading("Test", -60.0, 50.0, "temperature_too_low"),
+    InvalidReading("Test", 80.0, 50.0, "temperature_too_high"),
+    InvalidReading("Test", 20.0, -5.0, "humidity_too_low"),
+    InvalidReading("Test", 20.0, 105.0, "humidity_too_high"),
+    InvalidReading("   ", 20.0, 50.0, "empty_location"),
+)
@@ -5,7 +5,9 @@ import random
 import signal
 import subprocess
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Union
@@ -14,6 +16,7 @@ from typing import Dict, Optional, Union
 from dotenv import load_dotenv
 
 import django
+from django.apps import apps
 from django.utils import timezone
 
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -22,12 +25,19 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 project_dir = Path(__file__).parent.parent  # Point to project root
 sys.path.append(str(project_dir))
 
-# Setup Django
+# Setup Django, unless the importer (e.g. the test runner) already did
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "temperature.settings")
-django.setup()
+if not apps.ready:
+    django.setup()
 
 # Import shared services
-from services.switchbot_service import get_device_configs, get_switchbot_service
+from services.switchbot_service import (
+    SwitchBotAuthError,
+    SwitchBotRateLimitError,
+    classify_switchbot_error,
+    get_device_configs,
+    get_switchbot_service,
+)
 
 # Setup logging
 logging.basicConfig(
@@ -38,18 +48,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class DaemonConfig:
+    """Runtime configuration for the daemon.
+
+    Built from the environment in normal operation; tests can construct
+    one directly instead of patching os.environ.
+    """
+
+    interval: int = 600  # seconds; 10 min default to stay API-friendly
+    rate_limit_sleep_time: int = 300  # seconds
+    status_file: Path = field(
+        default_factory=lambda: Path(__file__).parent.parent / "daemon_status.json"
+    )
+    devices: Optional[Dict[str, str]] = None  # None -> get_device_configs()
+
+    @classmethod
+    def from_env(cls) -> "DaemonConfig":
+        """Read configuration from environment variables."""
+        return cls(
+            interval=int(os.getenv("TEMPERATURE_INTERVAL", "600")),
+            rate_limit_sleep_time=int(os.getenv("RATE_LIMIT_SLEEP_TIME", "300")),
+            status_file=Path(
+                os.getenv(
+                    "DAEMON_STATUS_FILE",
+                    Path(__file__).parent.parent / "daemon_status.json",
+                )
+            ),
+        )
+
+
 class TemperatureDaemon:
     """A daemon to periodically read temperature from SwitchBot devices and store it in the Django database."""
 
-    def __init__(self):
+    def __init__(self, config: Optional[DaemonConfig] = None):
+        self.config = config if config is not None else DaemonConfig.from_env()
         self.running = True
-        # Increased default interval to 10 minutes (600 seconds) to be API-friendly
-        self.interval = int(os.getenv("TEMPERATURE_INTERVAL", "600"))  # seconds
-
-        # Increased rate limit sleep to 5 minutes to avoid hitting API limits
-        self.rate_limit_sleep_time = int(
-            os.getenv("RATE_LIMIT_SLEEP_TIME", "300")
-        )  # seconds
+        # Set to interrupt interval/backoff waits immediately on shutdown
+        self._stop_event = threading.Event()
+        # Per-cycle device status cache: one status() call serves both
+        # the temperature and humidity readers (cleared by _poll_all)
+        self._status_cache: Dict[str, dict] = {}
+        self.interval = self.config.interval
+        self.rate_limit_sleep_time = self.config.rate_limit_sleep_time
 
         # Initialize retry state BEFORE device initialization
         self.rate_limit_retry_count = 0
@@ -59,12 +100,7 @@ class TemperatureDaemon:
 
         # Initialize status tracking BEFORE device initialization
         self.iteration_counter = 0
-        self.status_file = Path(
-            os.getenv(
-                "DAEMON_STATUS_FILE",
-                Path(__file__).parent.parent / "daemon_status.json",
-            )
-        )
+        self.status_file = self.config.status_file
         self.last_successful_reading = None
         self.start_time = datetime.now()
 
@@ -168,12 +204,13 @@ class TemperatureDaemon:
                 return False
 
         except Exception as e:
+            error_kind = classify_switchbot_error(e)
             error_str = str(e).lower()
 
-            if "429" in str(e) or "rate limit" in error_str:
+            if error_kind is SwitchBotRateLimitError:
                 logger.warning("SwitchBot API rate limited (API is working)")
                 return True  # Rate limit means API is working, just restricted
-            elif "401" in str(e) or "authentication" in error_str:
+            elif error_kind is SwitchBotAuthError:
                 logger.warning("SwitchBot API authentication issue")
                 return True  # Auth issue means API is reachable
             elif "timeout" in error_str or "connection" in error_str:
@@ -234,8 +271,11 @@ class TemperatureDaemon:
 
     def _init_devices(self):
         """Initialize device configuration by storing MAC addresses."""
-        # Use shared device configuration
-        self.devices = get_device_configs()
+        # Use the injected mapping when provided, else the shared config
+        if self.config.devices is not None:
+            self.devices = dict(self.config.devices)
+        else:
+            self.devices = get_device_configs()
 
         logger.info(
             f"Configured {len(self.devices)} devices: {list(self.devices.keys())}"
@@ -275,6 +315,7 @@ class TemperatureDaemon:
         """Handle shutdown signals gracefully."""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self._stop_event.set()
         # Update status to indicate shutdown
         self.status["running"] = False
         self._update_status()
@@ -320,8 +361,8 @@ class TemperatureDaemon:
                 f"API rate limiting may be severe."
             )
 
-        # Sleep for the calculated delay
-        time.sleep(retry_delay)
+        # Wait out the delay, waking immediately if a shutdown signal lands
+        self._stop_event.wait(retry_delay)
         return True
 
     def _reset_rate_limit_state(self):
@@ -335,6 +376,21 @@ class TemperatureDaemon:
             self.status["next_retry_interval"] = None
             self._update_status()
 
+    def _fetch_status(self, device_name) -> Optional[dict]:
+        """Fetch a device's full status once, for the per-cycle cache.
+
+        Failures are tolerated silently here; the single-metric readers
+        fall back to their own calls with full retry handling.
+        """
+        mac_address = self.devices.get(device_name)
+        if not mac_address:
+            return None
+        try:
+            return self.switchbot_service.get_device_status(mac_address)
+        except Exception as e:
+            logger.warning(f"Status fetch failed for {device_name}: {e}")
+            return None
+
     def get_temperature(self, device_name) -> Optional[float]:
         """Get temperature reading from a device with error handling and validation."""
         mac_address = self.devices.get(device_name)
@@ -342,6 +398,28 @@ class TemperatureDaemon:
             logger.error(f"Device {device_name} not found")
             return None
 
+        cached = self._status_cache.get(device_name)
+        if cached is not None:
+            temp_value = cached.get("temperature")
+            if temp_value is None:
+                logger.warning(f"No temperature reading from {device_name}")
+                return None
+            # The API can return status values as strings; coerce like
+            # SwitchBotService.get_temperature does
+            try:
+                temperature = float(temp_value)
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Non-numeric temperature reading from {device_name}: {temp_value!r}"
+                )
+                return None
+            if not (-50 <= temperature <= 70):
+                logger.warning(
+                    f"Invalid temperature reading from {device_name}: {temperature}°C"
+                )
+                return None
+            return temperature
+
         max_attempts = 3  # Maximum retry attempts for data collection
 
         for attempt in range(max_attempts):
@@ -366,10 +444,10 @@ class TemperatureDaemon:
                 return temperature
 
             except Exception as e:
-                error_str = str(e).lower()
+                error_kind = classify_switchbot_error(e)
 
                 # Handle rate limiting with exponential backoff
-                if "429" in str(e) or "rate limit" in error_str:
+                if error_kind is SwitchBotRateLimitError:
                     if attempt < max_attempts - 1:  # Don't retry on last attempt
                         logger.warning(
                             f"Rate limit during temperature reading for {device_name} (attempt {attempt + 1}/{max_attempts})"
@@ -385,7 +463,7 @@ class TemperatureDaemon:
                         return None
 
                 # Handle authentication errors - service handles retry internally
-                elif "401" in str(e) or "authentication" in error_str:
+                elif error_kind is SwitchBotAuthError:
                     logger.warning(
                         f"Authentication error for {device_name} - service will handle retry"
                     )
@@ -404,6 +482,28 @@ class TemperatureDaemon:
             logger.error(f"Device {device_name} not found")
             return None
 
+        cached = self._status_cache.get(device_name)
+        if cached is not None:
+            humidity_value = cached.get("humidity")
+            if humidity_value is None:
+                logger.warning(f"No humidity reading from {device_name}")
+                return None
+            # The API can return status values as strings; coerce like
+            # SwitchBotService.get_humidity does
+            try:
+                humidity = float(humidity_value)
+            except (TypeError, ValueError):
+                logger.warning(
+                    f"Non-numeric humidity reading from {device_name}: {humidity_value!r}"
+                )
+                return None
+            if not (0 <= humidity <= 100):
+                logger.warning(
+                    f"Invalid humidity reading from {device_name}: {humidity}%"
+                )
+                return None
+            return humidity
+
         max_attempts = 3  # Maximum retry attempts for data collection
 
         for attempt in range(max_attempts):
@@ -428,10 +528,10 @@ class TemperatureDaemon:
                 return humidity
 
             except Exception as e:
-                error_str = str(e).lower()
+                error_kind = classify_switchbot_error(e)
 
                 # Handle rate limiting with exponential backoff
-                if "429" in str(e) or "rate limit" in error_str:
+                if error_kind is SwitchBotRateLimitError:
                     if attempt < max_attempts - 1:  # Don't retry on last attempt
                         logger.warning(
                             f"Rate limit during humidity reading for {device_name} (attempt {attempt + 1}/{max_attempts})"
@@ -447,7 +547,7 @@ class TemperatureDaemon:
                         return None
 
                 # Handle authentication errors - service handles retry internally
-                elif "401" in str(e) or "authentication" in error_str:
+                elif error_kind is SwitchBotAuthError:
                     logger.warning(
                         f"Authentication error for {device_name} - service will handle retry"
                     )
@@ -459,6 +559,38 @@ class TemperatureDaemon:
 
         return None
 
+    def _read_device(self, device_name) -> tuple:
+        """Collect the (temperature, humidity) pair for one device."""
+        status = self._fetch_status(device_name)
+        if status is not None:
+            self._status_cache[device_name] = status
+        temperature = self.get_temperature(device_name)
+        humidity = self.get_humidity(device_name)
+        return temperature, humidity
+
+    def _poll_all(self) -> Dict[str, tuple]:
+        """Poll every configured device concurrently.
+
+        Each reading is a blocking HTTPS round trip to the SwitchBot
+        cloud; overlapping them bounds cycle latency by the slowest
+        device instead of the sum of all of them.
+        """
+        results = {}
+        self._status_cache.clear()
+        with ThreadPoolExecutor(max_workers=len(self.devices)) as executor:
+            futures = {
+                executor.submit(self._read_device, device_name): device_name
+                for device_name in self.devices
+            }
+            for future in as_completed(futures):
+                device_name = futures[future]
+                try:
+                    results[device_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Unexpected error polling {device_name}: {e}")
+                    results[device_name] = (None, None)
+        return results
+
     def store_temperature(
         self, device_name: str, temperature: float, humidity: float
     ) -> bool:
@@ -566,25 +698,18 @@ class TemperatureDaemon:
 
                 # Only try to collect data if we have devices
                 if self.devices:
-                    for device_name in self.devices.keys():
-                        try:
-                            temperature = self.get_temperature(device_name)
-                            humidity = self.get_humidity(device_name) or 0
-
-                            if temperature is not None:
-                                success = self.store_temperature(
-                                    device_name, temperature, humidity=humidity
-                                )
-                                if success:
-                                    cycle_success = True
-                            else:
-                                logger.warning(
-                                    f"Skipping storage for {device_name} due to invalid reading"
-                                )
-
-                        except Exception as e:
-                            logger.error(
-                                f"Unexpected error processing {device_name}: {e}"
+                    # Readings happen in parallel; storage stays on the
+                    # main thread so DB connections aren't shared
+                    for device_name, (temperature, humidity) in self._poll_all().items():
+                        if temperature is not None:
+                            success = self.store_temperature(
+                                device_name, temperature, humidity=humidity or 0
+                            )
+                            if success:
+                                cycle_success = True
+                        else:
+                            logger.warning(
+                                f"Skipping storage for {device_name} due to invalid reading"
                             )
                 else:
                     logger.warning("No devices available for data collection")
@@ -612,9 +737,10 @@ class TemperatureDaemon:
                 # Update status
                 self._update_status(consecutive_failures, cycle_success)
 
-                # Sleep between cycles
+                # Wait between cycles; a shutdown signal interrupts the
+                # wait instead of letting it run the full interval
                 if self.running:
-                    time.sleep(self.interval)
+                    self._stop_event.wait(self.interval)
 
         except KeyboardInterrupt:
             logger.info("Daemon interrupted by user")
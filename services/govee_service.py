@@ -77,13 +77,12 @@ class DjangoDatabaseService:
         timestamp = self.convert_timestamp(timestamp_str)
 
         from homepage.models import Temperature
-        temp_record = Temperature(
+        Temperature.create_validated(
             timestamp=timestamp,
             location=location,
             temperature=temperature,
             humidity=humidity
         )
-        temp_record.save()
 
 
 class GoveeService:
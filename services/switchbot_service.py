@@ -7,6 +7,29 @@ from switchbot import SwitchBot
 logger = logging.getLogger(__name__)
 
 
+class SwitchBotAuthError(Exception):
+    """Raised when the SwitchBot API rejects the configured credentials."""
+
+
+class SwitchBotRateLimitError(Exception):
+    """Raised when the SwitchBot API reports rate limiting."""
+
+
+def classify_switchbot_error(exc: Exception):
+    """Translate the library's string-typed errors into typed errors.
+
+    The switchbot package raises bare Exceptions whose message carries
+    the HTTP status; this is the one place that inspects those strings.
+    Returns the matching exception class, or None for unknown errors.
+    """
+    text = str(exc).lower()
+    if "429" in text or "rate limit" in text:
+        return SwitchBotRateLimitError
+    if "401" in text or "authentication" in text or "unauthorized" in text:
+        return SwitchBotAuthError
+    return None
+
+
 class SwitchBotService:
     """Service for interacting with SwitchBot devices."""
 
@@ -52,9 +75,8 @@ class SwitchBotService:
             temperature = float(temp_value)
             return temperature
         except Exception as e:
-            error_str = str(e).lower()
             # Handle authentication errors by resetting connection
-            if "401" in str(e) or "authentication" in error_str or "unauthorized" in error_str:
+            if classify_switchbot_error(e) is SwitchBotAuthError:
                 logger.warning(f"Authentication error getting temperature from {mac_address}, resetting connection: {e}")
                 self._reset_connection()
                 # Try once more with fresh connection
@@ -84,9 +106,8 @@ class SwitchBotService:
             humidity = float(humidity_value)
             return humidity
         except Exception as e:
-            error_str = str(e).lower()
             # Handle authentication errors by resetting connection
-            if "401" in str(e) or "authentication" in error_str or "unauthorized" in error_str:
+            if classify_switchbot_error(e) is SwitchBotAuthError:
                 logger.warning(f"Authentication error getting humidity from {mac_address}, resetting connection: {e}")
                 self._reset_connection()
                 # Try once more with fresh connection
@@ -112,9 +133,8 @@ class SwitchBotService:
             status = device.status()
             return status
         except Exception as e:
-            error_str = str(e).lower()
             # Handle authentication errors by resetting connection
-            if "401" in str(e) or "authentication" in error_str or "unauthorized" in error_str:
+            if classify_switchbot_error(e) is SwitchBotAuthError:
                 logger.warning(f"Authentication error getting device status from {mac_address}, resetting connection: {e}")
                 self._reset_connection()
                 # Try once more with fresh connection
@@ -150,16 +170,26 @@ class PreProdSwitchBotService(SwitchBotService):
         }
 
 
+# Memoized service instances keyed by environment flavour. Reusing the
+# service keeps its SwitchBot client (and the underlying TLS session)
+# alive across calls instead of re-handshaking on every fetch.
+_service_cache: Dict[bool, SwitchBotService] = {}
+
+
 def get_switchbot_service() -> SwitchBotService:
     """Factory function to get the appropriate SwitchBot service based on environment."""
     is_preprod = os.getenv("ENVIRONMENT", "production").lower() == "preprod"
 
-    if is_preprod:
-        logger.info("Using pre-production SwitchBot service")
-        return PreProdSwitchBotService()
-    else:
-        logger.info("Using production SwitchBot service")
-        return SwitchBotService()
+    service = _service_cache.get(is_preprod)
+    if service is None:
+        if is_preprod:
+            logger.info("Using pre-production SwitchBot service")
+            service = PreProdSwitchBotService()
+        else:
+            logger.info("Using production SwitchBot service")
+            service = SwitchBotService()
+        _service_cache[is_preprod] = service
+    return service
 
 
 def get_device_configs() -> Dict[str, str]:
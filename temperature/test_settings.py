@@ -12,11 +12,18 @@ DATABASES = {
     }
 }
 
-# Keep migrations for core Django apps but disable for custom apps if needed
-# This ensures django_content_type and other essential tables are created
-# MIGRATION_MODULES = {
-#     'homepage': None,  # Disable only custom app migrations if needed
-# }
+
+# Skip running the migration history and create the schema directly from
+# the current models; with an in-memory DB there is nothing to preserve
+class DisableMigrations:
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
 
 # Reduce password hashing rounds for faster tests
 PASSWORD_HASHERS = [
@@ -48,3 +55,10 @@ SECRET_KEY = "test-secret-key-only-for-testing"
 
 # Allow all hosts for testing
 ALLOWED_HOSTS = ["*"]
+
+# Make per-view caching a no-op so tests always observe the database
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
+}